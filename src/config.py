@@ -4,18 +4,112 @@ Device Configuration Management for Key Light Controller
 Handles persistent storage of device labels and settings using XDG standards
 """
 
+import atexit
 import json
+import mmap
 import os
-from typing import Dict, Optional
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize config data to indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes into config data"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _open_private(path: Path):
+    """Open path for binary writing, created with owner-only permissions"""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_CLOEXEC', 0)
+    return os.fdopen(os.open(path, flags, 0o600), 'wb')
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, mapping it into memory when it spans more than a page"""
+    # Below a page (or without orjson, which can parse the mapping in place)
+    # a plain read is cheaper than setting up the mapping
+    if orjson is None or path.stat().st_size <= mmap.PAGESIZE:
+        return _loads(path.read_bytes())
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for advice in ('MADV_SEQUENTIAL', 'MADV_WILLNEED'):
+            if hasattr(mmap, advice):
+                mm.madvise(getattr(mmap, advice))
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
 
 class DeviceConfig:
     """Manages persistent device configuration using XDG Base Directory standard"""
     
+    # Delay after the last mutation before pending changes are written out
+    FLUSH_DELAY_S = 0.2
+    # Minimum age of the backup file before a save refreshes it
+    BACKUP_INTERVAL_S = 24 * 60 * 60
+    
     def __init__(self):
         self.config_path = self._get_config_path()
+        
+        # Write coalescing: mutations mark the config dirty and a single
+        # save runs once changes settle (or when a batch block exits)
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._batch_depth = 0
+        # One long-lived writer thread waits for the flush deadline instead
+        # of a new timer thread per mutation; 0.0 means nothing scheduled
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_due = 0.0
+        self._writer: Optional[threading.Thread] = None
+        # Called with an error message when saves start failing, from
+        # whichever thread ran the save
+        self.on_save_failed: Optional[Callable[[str], None]] = None
+        self._save_error: Optional[str] = None
+        self._backup_path = self.config_path.with_suffix('.json.backup')
+        try:
+            self._last_backup_ts = self._backup_path.stat().st_mtime
+        except OSError:
+            self._last_backup_ts = 0.0
         self.config_data = self._load_config()
+        atexit.register(self.flush)
+    
+    @property
+    def config_data(self) -> Dict:
+        """Configuration contents"""
+        return self._config_data
+    
+    @config_data.setter
+    def config_data(self, value: Dict) -> None:
+        self._config_data = value
+        # Shared reference to config_data['devices'] for hot-path lookups
+        self._devices: Dict[str, Dict] = value.setdefault('devices', {})
+    
+    def __enter__(self) -> 'DeviceConfig':
+        """Batch mutations; a single save runs when the outermost block exits"""
+        with self._lock:
+            self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        with self._lock:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self.flush()
         
     def _get_config_path(self) -> Path:
         """Get configuration file path following XDG standards"""
@@ -40,14 +134,14 @@ class DeviceConfig:
         
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    # Validate config structure
-                    if "version" in config and "devices" in config:
-                        return config
-                    else:
-                        print(f"Warning: Invalid config structure in {self.config_path}, using defaults")
-                        return default_config
+                config = _read_json(self.config_path)
+                # Validate config structure
+                if "version" in config and "devices" in config:
+                    self._migrate_timestamps(config["devices"])
+                    return config
+                else:
+                    print(f"Warning: Invalid config structure in {self.config_path}, using defaults")
+                    return default_config
             else:
                 return default_config
         except (json.JSONDecodeError, IOError) as e:
@@ -55,31 +149,97 @@ class DeviceConfig:
             return default_config
     
     def _save_config(self) -> bool:
-        """Save configuration to file"""
+        """Save configuration to file atomically via a temp file and rename"""
+        tmp_path = self.config_path.with_suffix('.json.tmp')
         try:
-            # Create a backup if file exists
-            if self.config_path.exists():
-                backup_path = self.config_path.with_suffix('.json.backup')
-                self.config_path.replace(backup_path)
+            # Refresh the backup of the previous file at most once a day
+            if time.time() - self._last_backup_ts > self.BACKUP_INTERVAL_S:
+                self.create_backup()
             
-            # Write new config
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, indent=2, ensure_ascii=False)
+            # Write new config with owner-only permissions set at creation
+            with _open_private(tmp_path) as f:
+                f.write(_dumps(self.config_data))
+                f.flush()
+                os.fsync(f.fileno())
             
-            # Set proper permissions (read/write for owner only)
-            os.chmod(self.config_path, 0o600)
+            os.replace(tmp_path, self.config_path)
             return True
             
         except (IOError, OSError) as e:
             print(f"Error saving config to {self.config_path}: {e}")
+            self._save_error = f"Could not save {self.config_path}: {e}"
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+    
+    def create_backup(self) -> bool:
+        """Copy the current config file to device-labels.json.backup"""
+        if not self.config_path.exists():
+            return False
+        try:
+            shutil.copy(self.config_path, self._backup_path)
+            self._last_backup_ts = time.time()
+            return True
+        except (IOError, OSError) as e:
+            print(f"Warning: Error creating backup of {self.config_path}: {e}")
             return False
     
+    def _mark_dirty(self) -> bool:
+        """Schedule a coalesced save of the current configuration"""
+        with self._lock:
+            self._dirty = True
+            if self._batch_depth:
+                return True
+            self._flush_due = time.monotonic() + self.FLUSH_DELAY_S
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name='device-config-writer', daemon=True
+                )
+                self._writer.start()
+            else:
+                self._wakeup.notify()
+        return True
+    
+    def _write_loop(self) -> None:
+        """Writer thread: flush once the deadline set by _mark_dirty passes"""
+        with self._wakeup:
+            while True:
+                if not self._flush_due:
+                    self._wakeup.wait()
+                    continue
+                remaining = self._flush_due - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.wait(remaining)
+                    continue
+                self.flush()
+    
+    def flush(self) -> bool:
+        """Write pending changes to disk immediately; False if the save failed"""
+        with self._lock:
+            self._flush_due = 0.0
+            if not self._dirty:
+                return True
+            # Stay dirty on failure so the next change (or exit) retries
+            was_failing = self._save_error is not None
+            saved = self._save_config()
+            self._dirty = not saved
+            if saved:
+                self._save_error = None
+            elif not was_failing and self.on_save_failed is not None:
+                # Reported once per run of failures, not on every retry
+                self.on_save_failed(self._save_error)
+            return saved
+    
     def get_label(self, mac_address: str, original_name: str) -> str:
         """Get custom label for device, return original name if no custom label exists"""
         if not mac_address:
             return original_name
             
-        device_data = self.config_data.get('devices', {}).get(mac_address, {})
+        device_data = self._devices.get(mac_address)
+        if device_data is None:
+            return original_name
         return device_data.get('custom_label', original_name)
     
     def set_label(self, mac_address: str, original_name: str, custom_label: str, 
@@ -89,32 +249,73 @@ class DeviceConfig:
             print("Warning: Cannot set label - MAC address is required")
             return False
         
-        # Initialize devices dict if it doesn't exist
-        if 'devices' not in self.config_data:
-            self.config_data['devices'] = {}
-        
-        # Update device information
-        device_data = {
-            'original_name': original_name,
-            'custom_label': custom_label,
-            'last_seen': self._get_timestamp()
-        }
-        
-        if current_ip:
-            device_data['last_ip'] = current_ip
+        with self._lock:
+            # Nothing to persist if the stored entry already matches
+            existing = self._devices.get(mac_address)
+            if (existing is not None
+                    and existing.get('custom_label') == custom_label
+                    and existing.get('original_name') == original_name
+                    and existing.get('last_ip') == current_ip):
+                existing['last_seen'] = self._get_timestamp()
+                return True
+            
+            # Update in place so fields stored elsewhere (last_port,
+            # is_locked) survive a rename
+            device_data = self._devices.setdefault(mac_address, {})
+            device_data['original_name'] = original_name
+            device_data['custom_label'] = custom_label
+            device_data['last_seen'] = self._get_timestamp()
+            
+            if current_ip:
+                device_data['last_ip'] = current_ip
+            
+            return self._mark_dirty()
+    
+    @staticmethod
+    def is_stable_key(mac_address: str) -> bool:
+        """True for identifiers that survive address changes (not the IP_ fallback)"""
+        return bool(mac_address) and not mac_address.startswith('IP_')
+    
+    def record_device(self, mac_address: str, name: str, ip: str, port: int) -> bool:
+        """Remember the address a device was last seen at"""
+        # An IP_ key names an address, not a device; there is nothing to
+        # restore it by on the next start
+        if not self.is_stable_key(mac_address):
+            return False
         
-        self.config_data['devices'][mac_address] = device_data
+        with self._lock:
+            device_data = self._devices.setdefault(mac_address, {})
+            device_data['last_seen'] = self._get_timestamp()
+            if (device_data.get('original_name') == name
+                    and device_data.get('last_ip') == ip
+                    and device_data.get('last_port') == port):
+                return True
+            
+            device_data['original_name'] = name
+            device_data['last_ip'] = ip
+            device_data['last_port'] = port
+            return self._mark_dirty()
+    
+    def migrate_device(self, old_key: str, new_key: str) -> bool:
+        """Move a device entry stored under an older identifier to its current one"""
+        if not old_key or not new_key or old_key == new_key:
+            return False
         
-        return self._save_config()
+        with self._lock:
+            if old_key not in self._devices or new_key in self._devices:
+                return False
+            self._devices[new_key] = self._devices.pop(old_key)
+            return self._mark_dirty()
     
     def remove_label(self, mac_address: str) -> bool:
         """Remove custom label for device (reset to default)"""
         if not mac_address:
             return False
         
-        if mac_address in self.config_data.get('devices', {}):
-            del self.config_data['devices'][mac_address]
-            return self._save_config()
+        with self._lock:
+            if mac_address in self._devices:
+                del self._devices[mac_address]
+                return self._mark_dirty()
         
         return True  # Already removed/doesn't exist
     
@@ -123,15 +324,17 @@ class DeviceConfig:
         if not mac_address:
             return False
         
-        device_data = self.config_data.get('devices', {}).get(mac_address, {})
-        return 'custom_label' in device_data
+        device_data = self._devices.get(mac_address)
+        return device_data is not None and 'custom_label' in device_data
     
     def get_lock_state(self, mac_address: str) -> bool:
         """Get lock state for device, returns False if not set"""
         if not mac_address:
             return False
         
-        device_data = self.config_data.get('devices', {}).get(mac_address, {})
+        device_data = self._devices.get(mac_address)
+        if device_data is None:
+            return False
         return device_data.get('is_locked', False)
     
     def set_lock_state(self, mac_address: str, is_locked: bool) -> bool:
@@ -139,21 +342,17 @@ class DeviceConfig:
         if not mac_address:
             return False
         
-        # Initialize devices dict if it doesn't exist
-        if 'devices' not in self.config_data:
-            self.config_data['devices'] = {}
-        
-        # Initialize device data if it doesn't exist
-        if mac_address not in self.config_data['devices']:
-            self.config_data['devices'][mac_address] = {
-                'last_seen': self._get_timestamp()
-            }
-        
-        # Set lock state
-        self.config_data['devices'][mac_address]['is_locked'] = is_locked
-        self.config_data['devices'][mac_address]['last_seen'] = self._get_timestamp()
-        
-        return self._save_config()
+        with self._lock:
+            # Initialize device data if it doesn't exist
+            device_data = self._devices.get(mac_address)
+            if device_data is None:
+                device_data = self._devices[mac_address] = {}
+            
+            # Set lock state
+            device_data['is_locked'] = is_locked
+            device_data['last_seen'] = self._get_timestamp()
+            
+            return self._mark_dirty()
     
     def get_app_setting(self, setting_name: str, default_value=None):
         """Get application-level setting"""
@@ -162,59 +361,68 @@ class DeviceConfig:
     
     def set_app_setting(self, setting_name: str, value) -> bool:
         """Set application-level setting"""
-        if 'app_settings' not in self.config_data:
-            self.config_data['app_settings'] = {}
-        
-        self.config_data['app_settings'][setting_name] = value
-        return self._save_config()
+        with self._lock:
+            if 'app_settings' not in self.config_data:
+                self.config_data['app_settings'] = {}
+            
+            self.config_data['app_settings'][setting_name] = value
+            return self._mark_dirty()
+    
+    def set_app_settings_bulk(self, settings: Dict[str, Any]) -> bool:
+        """Set several application-level settings with a single save"""
+        if not settings:
+            return True
+        with self._lock:
+            self.config_data.setdefault('app_settings', {}).update(settings)
+            return self._mark_dirty()
     
     def get_all_devices(self) -> Dict[str, Dict]:
         """Get all configured devices"""
-        return self.config_data.get('devices', {})
+        return self._devices
     
     def cleanup_old_devices(self, days: int = 30) -> int:
         """Remove device configs older than specified days, return count removed"""
         if days <= 0:
             return 0
         
-        import time
         cutoff_time = time.time() - (days * 24 * 60 * 60)
-        devices = self.config_data.get('devices', {})
-        to_remove = []
+        devices = self._devices
         
-        for mac_address, device_data in devices.items():
-            last_seen = device_data.get('last_seen', 0)
-            if isinstance(last_seen, str):
-                # Convert ISO timestamp to unix timestamp for comparison
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(last_seen.replace('Z', '+00:00'))
-                    last_seen = dt.timestamp()
-                except (ValueError, AttributeError):
-                    last_seen = 0
+        # Scan and delete under one lock so an entry refreshed in between
+        # (e.g. by record_device) is not removed on stale data
+        with self._lock:
+            to_remove = [mac_address for mac_address, device_data in devices.items()
+                         if device_data.get('last_seen', 0.0) < cutoff_time]
+            for mac_address in to_remove:
+                del devices[mac_address]
             
-            if last_seen < cutoff_time:
-                to_remove.append(mac_address)
-        
-        for mac_address in to_remove:
-            del devices[mac_address]
-        
-        if to_remove:
-            self._save_config()
+            if to_remove:
+                self._mark_dirty()
         
         return len(to_remove)
     
-    def _get_timestamp(self) -> str:
-        """Get current timestamp in ISO format"""
-        from datetime import datetime, timezone
-        return datetime.now(timezone.utc).isoformat()
+    def _get_timestamp(self) -> float:
+        """Get current timestamp as Unix epoch seconds"""
+        return time.time()
+    
+    @staticmethod
+    def _migrate_timestamps(devices: Dict[str, Dict]) -> None:
+        """Convert legacy ISO-8601 last_seen values to epoch seconds in place"""
+        for device_data in devices.values():
+            last_seen = device_data.get('last_seen')
+            if isinstance(last_seen, str):
+                try:
+                    dt = datetime.fromisoformat(last_seen.replace('Z', '+00:00'))
+                    device_data['last_seen'] = dt.timestamp()
+                except ValueError:
+                    device_data['last_seen'] = 0.0
     
     def export_config(self, export_path: str) -> bool:
         """Export configuration to specified file"""
         try:
             export_file = Path(export_path)
-            with open(export_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, indent=2, ensure_ascii=False)
+            with _open_private(export_file) as f:
+                f.write(_dumps(self.config_data))
             return True
         except (IOError, OSError) as e:
             print(f"Error exporting config to {export_path}: {e}")
@@ -228,18 +436,19 @@ class DeviceConfig:
                 print(f"Import file does not exist: {import_path}")
                 return False
             
-            with open(import_file, 'r', encoding='utf-8') as f:
-                imported_config = json.load(f)
-            
-            if merge:
-                # Merge with existing config
-                imported_devices = imported_config.get('devices', {})
-                self.config_data.setdefault('devices', {}).update(imported_devices)
-            else:
-                # Replace entire config
-                self.config_data = imported_config
+            imported_config = _read_json(import_file)
+            self._migrate_timestamps(imported_config.get('devices', {}))
             
-            return self._save_config()
+            with self._lock:
+                if merge:
+                    # Merge with existing config
+                    imported_devices = imported_config.get('devices', {})
+                    self._devices.update(imported_devices)
+                else:
+                    # Replace entire config
+                    self.config_data = imported_config
+                
+                return self._mark_dirty()
             
         except (json.JSONDecodeError, IOError, OSError) as e:
             print(f"Error importing config from {import_path}: {e}")
@@ -1,85 +1,270 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict
+import socket
+import sys
+import time
+from typing import Dict, Optional, Set, Tuple
 
 try:
     import aiohttp
 except ImportError:  # pragma: no cover - runtime dependency
     aiohttp = None  # type: ignore
 
-from zeroconf import ServiceBrowser, Zeroconf, ServiceStateChange
-from PySide6.QtCore import QObject, Signal
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
+from zeroconf import ServiceStateChange
+from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .service import KeyLightService
+
+
+# accessory-info fields that may carry the device identifier, in order of preference
+_MAC_KEYS = ("macAddress", "mac", "serialNumber")
+# Separators stripped when normalizing a MAC address
+_MAC_STRIP = str.maketrans("", "", ":-")
+_MAC_PROBE_TIMEOUT = aiohttp.ClientTimeout(total=3) if aiohttp is not None else None
 
 
 class KeyLightDiscovery(QObject):
     """Discovers Key Light devices on the network using mDNS.
 
+    Browsing runs on the application's asyncio loop, so discovery callbacks
+    and MAC lookups happen on the UI thread without signal round-trips.
+
     Emits:
       - device_found(dict): when a device is fully identified
-      - mac_fetch_requested(dict): when MAC lookup should be performed
     """
 
     device_found = Signal(dict)
-    mac_fetch_requested = Signal(dict)
 
-    def __init__(self) -> None:
+    # How long a resolved MAC address is trusted for an IP (DHCP may reassign it)
+    MAC_CACHE_TTL_S = 60 * 60
+
+    def __init__(self, service: KeyLightService | None = None) -> None:
         super().__init__()
-        self.zeroconf = Zeroconf()
-        self.browser: ServiceBrowser | None = None
+        # When given, MAC lookups share the service's connection pool
+        self._service = service
+        self.aiozc: AsyncZeroconf | None = None
+        self.browser: AsyncServiceBrowser | None = None
+        self._active = False
+        self._pending: Set[asyncio.Future] = set()
+        self._closing: asyncio.Future | None = None
+        self._session: aiohttp.ClientSession | None = None
+        # ip -> (mac, service name, monotonic expiry) for addresses the
+        # device itself identified
+        self._mac_cache: Dict[str, Tuple[str, str, float]] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session used for MAC lookups."""
+        if self._service is not None:
+            return await self._service.get_session()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=4, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def aclose(self) -> None:
+        """Wait for zeroconf shutdown and close the shared HTTP session."""
+        for task in list(self._pending):
+            task.cancel()
+        if self._closing is not None:
+            await asyncio.gather(self._closing, return_exceptions=True)
+            self._closing = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _track(self, coro) -> None:
+        """Run a coroutine on the loop, keeping a reference until it finishes."""
+        task = asyncio.ensure_future(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
 
     def start_discovery(self) -> None:
         """Start discovering Key Light devices."""
-        self.browser = ServiceBrowser(
-            self.zeroconf,
+        self._active = True
+        # Zeroconf binds to the loop that is running when it is created, so
+        # defer until the Qt/asyncio loop is up
+        QTimer.singleShot(0, self._start_browser)
+
+    def _start_browser(self) -> None:
+        if not self._active or self.aiozc is not None:
+            return
+        self.aiozc = AsyncZeroconf()
+        self.browser = AsyncServiceBrowser(
+            self.aiozc.zeroconf,
             "_elg._tcp.local.",
             handlers=[self._on_service_state_change],
         )
 
     def _on_service_state_change(self, zeroconf, service_type, name, state_change):
         """Handle service discovery events."""
-        if state_change == ServiceStateChange.Added:
-            info = zeroconf.get_service_info(service_type, name)
-            if info and info.addresses:
-                device_info: Dict[str, str | int] = {
-                    "name": name.replace("._elg._tcp.local.", ""),
-                    "ip": ".".join(map(str, info.addresses[0])),
-                    "port": info.port,
-                }
-                # Request MAC address fetch from main thread
-                self.mac_fetch_requested.emit(device_info)
-
-    async def _fetch_mac_address(self, device_info: Dict):
+        if state_change is not ServiceStateChange.Added:
+            return
+        self._track(self._handle_added(zeroconf, service_type, name))
+
+    async def _handle_added(self, zeroconf, service_type: str, name: str) -> None:
+        """Resolve a newly announced service and report it once identified."""
+        try:
+            info = AsyncServiceInfo(service_type, name)
+            if not await info.async_request(zeroconf, 3000):
+                return
+            # IPv4 only by default; inet_ntoa rejects 16-byte IPv6 addresses
+            address = next((a for a in info.addresses if len(a) == 4), None)
+            if address is None:
+                return
+            device_info: Dict[str, str | int] = {
+                "name": name.replace("._elg._tcp.local.", ""),
+                "ip": socket.inet_ntoa(address),
+                "port": info.port,
+            }
+            # Elgato lights advertise their MAC as the TXT "id" record. It is
+            # only a fallback: the accessory-info identifier stays the key so
+            # devices stored under it (e.g. by serial number) keep their entries
+            await self._fetch_mac_address(device_info, self._mac_from_txt(info.properties))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: Error resolving discovered service {name}: {e}")
+
+    @staticmethod
+    def _mac_from_txt(properties: Dict[bytes, Optional[bytes]]) -> Optional[str]:
+        value = properties.get(b"id")
+        if not value:
+            return None
+        mac = value.decode("ascii", "ignore").upper().translate(_MAC_STRIP)
+        if len(mac) == 12 and all(c in "0123456789ABCDEF" for c in mac):
+            return mac
+        return None
+
+    async def _fetch_mac_address(self, device_info: Dict, txt_id: Optional[str] = None):
         """Fetch MAC address from device and emit the complete device info."""
         mac_address = await self._get_device_mac_address(
-            device_info["ip"], device_info["port"]
+            device_info["ip"], device_info["port"], device_info["name"], txt_id
         )
         device_info["mac_address"] = mac_address
+        if txt_id and txt_id != mac_address:
+            # Entries may have been stored under the TXT id; let the
+            # receiver move them to the canonical key
+            device_info["previous_ids"] = [txt_id]
         self.device_found.emit(device_info)
 
-    async def _get_device_mac_address(self, ip: str, port: int) -> str:
-        """Get MAC address from device API or ARP table."""
-        # Try the device's accessory-info endpoint
+    async def _get_device_mac_address(
+        self, ip: str, port: int, name: str = "", txt_id: Optional[str] = None
+    ) -> str:
+        """Get MAC address from device API, TXT record or ARP table."""
+        mac = await self.resolve_identifier(ip, port, name, txt_id)
+        if mac:
+            return mac
+
+        # Last resort: use IP address as a fallback identifier
+        return f"IP_{ip.replace('.', '_')}"
+
+    async def resolve_identifier(
+        self, ip: str, port: int, name: str = "", txt_id: Optional[str] = None
+    ) -> Optional[str]:
+        """Identify the device at ip:port, or None if nothing answers.
+
+        Used for both discovery and restoring known devices, so one light
+        always gets the same key: the accessory-info identifier first, then
+        the mDNS TXT id, then the ARP table.
+        """
+        # A hit only counts for the same service name: a different light
+        # announcing from this IP (DHCP reassignment, swap) is probed afresh
+        cached = self._mac_cache.get(ip)
+        if cached is not None and cached[1] == name and cached[2] > time.monotonic():
+            return cached[0]
+        self._mac_cache.pop(ip, None)
+
+        mac, confirmed = await self._resolve_mac_address(ip, port, txt_id)
+        # ARP answers may be stale; only the device's own answer is cached
+        if mac and confirmed:
+            self._mac_cache[ip] = (mac, name, time.monotonic() + self.MAC_CACHE_TTL_S)
+        return mac
+
+    async def _resolve_mac_address(
+        self, ip: str, port: int, txt_id: Optional[str] = None
+    ) -> Tuple[Optional[str], bool]:
+        """Return (mac, confirmed), confirmed when the device itself answered."""
+        if not self._has_proc_arp():
+            # `arp -n` forks a process; only pay for it when neither the
+            # device nor its announcement identified it
+            mac = await self._probe_http(ip, port)
+            if mac:
+                return mac, True
+            return (txt_id or await self._arp_lookup(ip)), False
+
+        # Reading /proc/net/arp is cheap, so query it alongside the device.
+        # The device's own answer wins so the identifier stays stable
+        # across runs.
+        http_task = asyncio.ensure_future(self._probe_http(ip, port))
+        arp_task = asyncio.ensure_future(self._arp_lookup(ip))
+        mac = await http_task
+        if mac or txt_id:
+            arp_task.cancel()
+            return (mac, True) if mac else (txt_id, False)
+
+        # Fallback: ARP table. Retry once if the entry was missing, since the
+        # HTTP attempt itself may have just populated it.
+        return (await arp_task or await self._arp_lookup(ip)), False
+
+    @staticmethod
+    def _has_proc_arp() -> bool:
+        return sys.platform.startswith("linux")
+
+    async def _probe_http(self, ip: str, port: int) -> Optional[str]:
+        """Read the MAC address from the device's accessory-info endpoint."""
+        if aiohttp is None:
+            return None
         try:
-            if aiohttp is None:
-                raise RuntimeError("aiohttp not available")
             url = f"http://{ip}:{port}/elgato/accessory-info"
-            timeout = aiohttp.ClientTimeout(total=3)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
+            session = await self._get_session()
+            async with session.get(url, timeout=_MAC_PROBE_TIMEOUT) as response:
+                if response.status == 200:
+                    if orjson is not None:
+                        data = orjson.loads(await response.read())
+                    else:
                         data = await response.json()
-                        mac = (
-                            data.get("macAddress")
-                            or data.get("mac")
-                            or data.get("serialNumber")
-                        )
+                    for key in _MAC_KEYS:
+                        mac = data.get(key)
                         if mac:
-                            return mac.upper().replace(":", "").replace("-", "")
+                            return mac.upper().translate(_MAC_STRIP)
         except Exception:
             pass
+        return None
+
+    async def _arp_lookup(self, ip: str) -> Optional[str]:
+        """Look up a MAC address in the kernel ARP table without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        if self._has_proc_arp():
+            return await loop.run_in_executor(None, self._read_proc_arp, ip)
+        return await loop.run_in_executor(None, self._run_arp_command, ip)
+
+    @staticmethod
+    def _read_proc_arp(ip: str) -> Optional[str]:
+        """Read a MAC address for ip from /proc/net/arp."""
+        try:
+            with open("/proc/net/arp", "r", encoding="ascii") as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 4 or fields[0] != ip:
+                        continue
+                    # Flags 0x0 marks an incomplete entry
+                    if fields[2] != "0x0" and fields[3] != "00:00:00:00:00:00":
+                        return fields[3].upper().translate(_MAC_STRIP)
+        except OSError:
+            pass
+        return None
 
-        # Fallback: ARP table
+    @staticmethod
+    def _run_arp_command(ip: str) -> Optional[str]:
+        """Parse `arp -n` output on platforms without /proc/net/arp."""
         try:
             import subprocess
 
@@ -93,16 +278,23 @@ class KeyLightDiscovery(QObject):
                         parts = line.split()
                         for part in parts:
                             if ":" in part and len(part.replace(":", "")) == 12:
-                                return part.upper().replace(":", "")
+                                return part.upper().translate(_MAC_STRIP)
         except Exception:
             pass
-
-        # Last resort: use IP address as a fallback identifier
-        return f"IP_{ip.replace('.', '_')}"
+        return None
 
     def stop_discovery(self) -> None:
         """Stop discovery and cleanup."""
-        if self.browser:
-            self.browser.cancel()
-        self.zeroconf.close()
+        self._active = False
+        if self.aiozc is None:
+            return
+        browser, aiozc = self.browser, self.aiozc
+        self.browser = None
+        self.aiozc = None
+        self._closing = asyncio.ensure_future(self._close_zeroconf(browser, aiozc))
 
+    @staticmethod
+    async def _close_zeroconf(browser: AsyncServiceBrowser | None, aiozc: AsyncZeroconf) -> None:
+        if browser is not None:
+            await browser.async_cancel()
+        await aiozc.async_close()
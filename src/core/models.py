@@ -1,6 +1,17 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 
 
+def _slotted(cls):
+    """Rebuild a dataclass with __slots__, as dataclass(slots=True) does on 3.10+."""
+    names = tuple(f.name for f in fields(cls))
+    namespace = {k: v for k, v in cls.__dict__.items() if k not in names}
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
 @dataclass
 class KeyLight:
     """Represents a Key Light device and its state."""
@@ -11,4 +22,13 @@ class KeyLight:
     on: bool = False
     brightness: int = 50
     temperature: int = 200  # 143-344 (Elgato units, ~7000K-2900K)
+    url: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.url = f"http://{self.ip}:{self.port}/elgato/lights"
 
+    def set_address(self, ip: str, port: int) -> None:
+        """Point the device at a new address, e.g. after a DHCP change."""
+        self.ip = ip
+        self.port = port
+        self.url = f"http://{ip}:{port}/elgato/lights"
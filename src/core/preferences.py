@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 from PySide6.QtCore import QObject, Signal
 
 from config import DeviceConfig
-from .settings_schema import defaults_dict
+from .settings_schema import DEFAULTS
 
 
 class PreferencesService(QObject):
@@ -16,8 +16,11 @@ class PreferencesService(QObject):
     def __init__(self, device_config: DeviceConfig | None = None) -> None:
         super().__init__()
         self._config = device_config or DeviceConfig()
-        self._defaults: Dict[str, Any] = defaults_dict()
+        self._defaults: Mapping[str, Any] = DEFAULTS
         self._cache: Dict[str, Any] = {}
+        # Bulk mode: per-key signals are folded into one settings_applied
+        self._bulk_depth = 0
+        self._pending_changes: Dict[str, Any] = {}
         self._load()
 
     # --- API ---
@@ -36,7 +39,7 @@ class PreferencesService(QObject):
         self._cache[key] = value
         if persist:
             self._persist_one(key, value)
-        self.setting_changed.emit(key, value)
+        self._notify(key, value)
 
     def all(self) -> Dict[str, Any]:
         return dict(self._cache)
@@ -47,12 +50,28 @@ class PreferencesService(QObject):
             if self._cache.get(k) != v:
                 self._cache[k] = v
                 changed[k] = v
-        if persist and changed:
-            for k, v in changed.items():
-                self._persist_one(k, v)
-        if changed:
-            for k, v in changed.items():
-                self.setting_changed.emit(k, v)
+        if not changed:
+            return
+        if persist:
+            self._persist_many(changed)
+        self.begin_bulk()
+        try:
+            self._pending_changes.update(changed)
+        finally:
+            self.end_bulk()
+
+    def begin_bulk(self) -> None:
+        """Suppress setting_changed until the matching end_bulk()."""
+        self._bulk_depth += 1
+
+    def end_bulk(self) -> None:
+        """Leave bulk mode; emits one settings_applied if anything changed.
+
+        Listeners should re-read values via get() rather than per-key signals.
+        """
+        self._bulk_depth -= 1
+        if self._bulk_depth == 0 and self._pending_changes:
+            self._pending_changes.clear()
             self.settings_applied.emit(dict(self._cache))
 
     def reset_to_defaults(self) -> None:
@@ -68,13 +87,19 @@ class PreferencesService(QObject):
 
     # --- internals ---
     def _load(self) -> None:
-        # Initialize from config, falling back to defaults
+        # Initialize from config, falling back to defaults. Defaults are not
+        # written back: get() already falls back to them for missing keys.
         for key, def_val in self._defaults.items():
-            val = self._config.get_app_setting(key, def_val)
-            self._cache[key] = val
-            # Ensure defaults are written at least once
-            if val == def_val:
-                self._config.set_app_setting(key, val)
+            self._cache[key] = self._config.get_app_setting(key, def_val)
+
+    def _notify(self, key: str, value: Any) -> None:
+        if self._bulk_depth:
+            self._pending_changes[key] = value
+        else:
+            self.setting_changed.emit(key, value)
 
     def _persist_one(self, key: str, value: Any) -> None:
         self._config.set_app_setting(key, value)
+
+    def _persist_many(self, values: Dict[str, Any]) -> None:
+        self._config.set_app_settings_bulk(values)
@@ -1,63 +1,223 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 
 try:
     import aiohttp
 except ImportError:  # pragma: no cover
     aiohttp = None  # type: ignore
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
 from .models import KeyLight
 
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# PUT body for a single light; only the three values change between requests
+_STATE_TEMPLATE = b'{"numberOfLights":1,"lights":[{"on":%d,"brightness":%d,"temperature":%d}]}'
+
+
+def _light_values(keylight: KeyLight) -> Tuple[int, int, int]:
+    """The (on, brightness, temperature) values sent for a device."""
+    return (1 if keylight.on else 0, keylight.brightness, keylight.temperature)
+
+
+def _encode_state(values: Tuple[int, int, int]) -> bytes:
+    """Encode the PUT body for a device's (on, brightness, temperature) values."""
+    return _STATE_TEMPLATE % values
+
+
 class KeyLightService:
     """HTTP service for interacting with Elgato Key Light devices."""
 
+    # After a PUT, further updates to that device wait this long and collapse into one
+    UPDATE_COALESCE_S = 0.05
+    # After a failed request, further requests to that device are skipped for this long
+    FAILURE_BACKOFF_S = 1.0
+    # While updates keep arriving, changes smaller than these steps are held
+    # back; the exact value is sent once the updates settle
+    MIN_BRIGHTNESS_STEP = 2
+    MIN_TEMPERATURE_STEP = 4
+
     def __init__(self, timeout_seconds: float = 2.0) -> None:
-        self._timeout = timeout_seconds
+        self.timeout = timeout_seconds
+        self._session: aiohttp.ClientSession | None = None
+        # Latest requested state and its flush task, keyed by (ip, port)
+        self._pending: Dict[Tuple[str, int], KeyLight] = {}
+        self._tasks: Dict[Tuple[str, int], asyncio.Task] = {}
+        # Monotonic deadline until which an unreachable device is not contacted
+        self._fail_until: Dict[Tuple[str, int], float] = {}
+        # Values of the last PUT each device accepted, to skip resending them
+        self._last_sent: Dict[Tuple[str, int], Tuple[int, int, int]] = {}
+
+    @property
+    def timeout(self) -> float:
+        """Per-request timeout in seconds."""
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, seconds: float) -> None:
+        self._timeout = seconds
+        # Built once here rather than on every request
+        self._client_timeout = (
+            aiohttp.ClientTimeout(total=seconds) if aiohttp is not None else None
+        )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=16, limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=30
+            )
+            # Devices set no cookies and never redirect; skip that bookkeeping
+            self._session = aiohttp.ClientSession(
+                connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+            )
+        return self._session
+
+    def _backing_off(self, key: Tuple[str, int]) -> bool:
+        """Return True while a device is inside its failure backoff window."""
+        until = self._fail_until.get(key)
+        if until is None:
+            return False
+        if time.monotonic() < until:
+            return True
+        del self._fail_until[key]
+        return False
+
+    def _record_failure(self, key: Tuple[str, int]) -> None:
+        self._fail_until[key] = time.monotonic() + self.FAILURE_BACKOFF_S
+
+    async def aclose(self) -> None:
+        """Flush queued updates and close the shared HTTP session."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def set_light_state(self, keylight: KeyLight) -> None:
-        """Send state update to a device."""
+        """Queue a state update; updates within a short window are coalesced."""
+        self.queue_light_state(keylight)
+
+    def queue_light_state(self, keylight: KeyLight) -> None:
+        """Synchronous form of set_light_state() for callers on the loop thread.
+
+        A flush task is only created for the first update in each window, so
+        callers need not wrap every change in a task of their own.
+        """
         if aiohttp is None:
             return
 
-        url = f"http://{keylight.ip}:{keylight.port}/elgato/lights"
-        data = {
-            "numberOfLights": 1,
-            "lights": [
-                {
-                    "on": 1 if keylight.on else 0,
-                    "brightness": keylight.brightness,
-                    "temperature": keylight.temperature,
-                }
-            ],
-        }
+        key = (keylight.ip, keylight.port)
+        self._pending[key] = keylight
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.get_running_loop().create_task(self._flush_after(key))
+
+    async def _flush_after(self, key: Tuple[str, int]) -> None:
+        """Send the latest queued state for a device, one request at a time."""
+        held_back: Optional[KeyLight] = None
+        # Callers (the controller's batch timer) already debounce, so the
+        # first update goes out at once; only later ones wait to coalesce.
+        # sleep(0) still merges updates queued in the same loop pass.
+        delay = 0.0
         try:
-            timeout = aiohttp.ClientTimeout(total=self._timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.put(url, json=data) as response:
-                    if response.status != 200:
-                        # Keep silent to avoid UI spam in production
-                        pass
-        except asyncio.TimeoutError:
-            pass
-        except Exception:
-            pass
+            while True:
+                await asyncio.sleep(delay)
+                delay = self.UPDATE_COALESCE_S
+                until = self._fail_until.get(key)
+                if until is not None and self._backing_off(key):
+                    if key not in self._pending and held_back is None:
+                        break
+                    # Keep the latest state and send it once the device
+                    # may be reachable again
+                    await asyncio.sleep(max(0.0, until - time.monotonic()))
+                    continue
+                keylight = self._pending.pop(key, None)
+                if keylight is None:
+                    # Updates have settled; send the exact value if a small
+                    # step was skipped along the way
+                    if held_back is not None:
+                        await self._put_state(held_back)
+                    break
+                sent = await self._put_state(keylight, skip_minor=True)
+                held_back = None if sent else keylight
+        finally:
+            self._tasks.pop(key, None)
+
+    def _is_minor_step(self, key: Tuple[str, int], values: Tuple[int, int, int]) -> bool:
+        last = self._last_sent.get(key)
+        return (
+            last is not None
+            and last[0] == values[0]
+            and abs(last[1] - values[1]) < self.MIN_BRIGHTNESS_STEP
+            and abs(last[2] - values[2]) < self.MIN_TEMPERATURE_STEP
+        )
+
+    async def _put_state(self, keylight: KeyLight, skip_minor: bool = False) -> bool:
+        """Send state update to a device.
+
+        Returns False only when skip_minor held back a small change.
+        """
+        key = (keylight.ip, keylight.port)
+        if self._backing_off(key):
+            return True
+        values = _light_values(keylight)
+        if self._last_sent.get(key) == values:
+            return True
+        if skip_minor and self._is_minor_step(key, values):
+            return False
+        body = _encode_state(values)
+        try:
+            session = await self.get_session()
+            async with session.put(
+                keylight.url,
+                data=body,
+                headers=_JSON_HEADERS,
+                timeout=self._client_timeout,
+                allow_redirects=False,
+            ) as response:
+                if response.status == 200:
+                    self._last_sent[key] = values
+                else:
+                    # Keep silent to avoid UI spam in production
+                    self._last_sent.pop(key, None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+            self._last_sent.pop(key, None)
+            self._record_failure(key)
+        return True
 
     async def fetch_light_state(self, keylight: KeyLight) -> Optional[dict]:
         """Fetch current device state. Returns dict or None on failure."""
         if aiohttp is None:
             return None
 
-        url = f"http://{keylight.ip}:{keylight.port}/elgato/lights"
+        key = (keylight.ip, keylight.port)
+        if self._backing_off(key):
+            return None
         try:
-            timeout = aiohttp.ClientTimeout(total=self._timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-        except Exception:
+            session = await self.get_session()
+            async with session.get(
+                keylight.url, timeout=self._client_timeout, allow_redirects=False
+            ) as response:
+                if response.status == 200:
+                    # The device may have been changed elsewhere; the next
+                    # PUT must not be skipped against stale values
+                    self._last_sent.pop(key, None)
+                    if orjson is not None:
+                        return orjson.loads(await response.read())
+                    return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+            self._record_failure(key)
+        except ValueError:
+            # Malformed JSON body; the device is reachable, so no backoff
             pass
         return None
 
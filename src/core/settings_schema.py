@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import types
 from dataclasses import dataclass
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Mapping
 
 
 MasterPowerSemantics = Literal["AnyOn", "AllOn"]
@@ -43,7 +44,7 @@ class AdvancedSettings:
     enable_debug_logging: bool = False
 
 
-def defaults_dict() -> Dict[str, Any]:
+def _build_defaults() -> Dict[str, Any]:
     g = GeneralSettings()
     f = FeatureSettings()
     p = PerformanceSettings()
@@ -74,3 +75,13 @@ def defaults_dict() -> Dict[str, Any]:
         "advanced.master_power_semantics": a.master_power_semantics,
         "advanced.enable_debug_logging": a.enable_debug_logging,
     }
+
+
+_DEFAULTS: Dict[str, Any] = _build_defaults()
+
+# Read-only view of the defaults for consumers that never mutate them
+DEFAULTS: Mapping[str, Any] = types.MappingProxyType(_DEFAULTS)
+
+
+def defaults_dict() -> Dict[str, Any]:
+    return dict(_DEFAULTS)
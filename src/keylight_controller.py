@@ -9,15 +9,15 @@ __author__ = "Your Name"
 __license__ = "GPL-3.0"
 
 import sys
-import socket
 import asyncio
 import signal
 
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QSocketNotifier
 
 from utils.single_instance import SingleInstance
 from ui.main_window import KeyLightController
+from ui.styles.dark_theme import get_palette, get_style
 
 
 def main() -> None:
@@ -31,16 +31,14 @@ def main() -> None:
     single_instance = SingleInstance()
     if single_instance.is_running():
         print("Key Light Control is already running.")
-        try:
-            signal_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            signal_socket.connect(("127.0.0.1", 45654))
-            signal_socket.close()
-        except Exception:
-            pass
+        single_instance.notify_running()
         sys.exit(0)
 
     app = QApplication(sys.argv)
     app.setApplicationName("Key Light Control")
+    # Parsed once for every window and dialog
+    app.setPalette(get_palette())
+    app.setStyleSheet(get_style())
 
     # Integrate asyncio event loop with Qt
     try:
@@ -81,10 +79,10 @@ def main() -> None:
         except Exception:
             pass
 
-    # Allow secondary invocations to activate existing window
+    # Allow secondary invocations to activate existing window; the notifier
+    # wakes the loop only when a connection is actually pending
     def check_for_activation():
         try:
-            single_instance.socket.setblocking(False)
             conn, _addr = single_instance.socket.accept()
             conn.close()
             controller.show()
@@ -93,13 +91,20 @@ def main() -> None:
         except Exception:
             pass
 
-    activation_timer = QTimer()
-    activation_timer.timeout.connect(check_for_activation)
-    activation_timer.start(100)
+    single_instance.socket.setblocking(False)
+    controller.activation_notifier = QSocketNotifier(
+        single_instance.socket.fileno(), QSocketNotifier.Read, controller
+    )
+    controller.activation_notifier.activated.connect(check_for_activation)
 
     try:
         with loop:
             loop.run_forever()
+            # Close shared HTTP sessions before the loop is torn down
+            try:
+                loop.run_until_complete(controller.aclose())
+            except Exception:
+                pass
     finally:
         single_instance.cleanup()
 
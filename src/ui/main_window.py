@@ -3,8 +3,10 @@ from __future__ import annotations
 import asyncio
 import sys
 import socket
+import time
+from functools import lru_cache
 
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import QSize, Qt, QTimer, Signal
 from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -16,10 +18,11 @@ from PySide6.QtWidgets import (
     QLabel,
     QScrollArea,
     QSystemTrayIcon,
-    QGraphicsBlurEffect,
+    QMessageBox,
 )
 from PySide6.QtWidgets import QMenu  # kept for type hints elsewhere if needed
 from utils.system_tray import create_tray_icon
+from utils.color_utils import slider_color_for_temp
 
 from config import DeviceConfig
 from core.models import KeyLight
@@ -31,25 +34,69 @@ from ui.widgets.keylight_widget import KeyLightWidget
 from ui.preferences.settings_dialog import SettingsDialog
 
 
+@lru_cache(maxsize=None)
+def _gradient_stop_positions(count: int) -> tuple:
+    """Evenly spaced "stop:x.xx" prefixes for a gradient of count colors (count >= 2)."""
+    return tuple(f"stop:{i / (count - 1):.2f}" for i in range(count))
+
+
 class KeyLightController(QMainWindow):
     """Main application window"""
 
+    # Emitted from whichever thread saved the config; delivered queued
+    config_save_failed = Signal(str)
+
     def __init__(self):
         super().__init__()
         self.keylights = []
+        # Same devices keyed by IP, for duplicate checks on re-announcements
+        self._keylights_by_ip = {}
         self.keylight_widgets = []
+        # MAC (or IP when unknown) -> widget, so re-announced devices reuse theirs
+        self._widgets_by_key = {}
         self.device_config = DeviceConfig()
-        self.discovery = KeyLightDiscovery()
+        self.device_config.on_save_failed = self.config_save_failed.emit
+        self.config_save_failed.connect(self._on_config_save_failed, Qt.QueuedConnection)
         self.service = KeyLightService()
+        self.discovery = KeyLightDiscovery(self.service)
         self.prefs = PreferencesService(self.device_config)
         self.master_device_widget = None  # Will be created in setup_ui
+        # Widgets with unsent changes; flushed together when the timer fires
+        self._dirty_widgets = set()
+        self._last_widget_flush = 0.0
+        self._widget_update_interval_ms = 100
+        # Dimming layer shown behind modal dialogs
+        self._dim_overlay = None
+        # Window size to restore once the dialog closes
+        self._original_size: QSize | None = None
+        # Device colors behind the master button's current stylesheet
+        self._master_style_key = None
+        # Set while a post-add refresh is queued
+        self._pending_refresh = False
+        self.widget_update_timer = QTimer(self)
+        self.widget_update_timer.setSingleShot(True)
+        self.widget_update_timer.timeout.connect(self._flush_widget_updates)
+        # Widgets whose labels and colors trail their sliders; one timer for all
+        self._refresh_widgets = set()
+        self.widget_refresh_timer = QTimer(self)
+        self.widget_refresh_timer.setSingleShot(True)
+        self.widget_refresh_timer.setInterval(16)
+        self.widget_refresh_timer.timeout.connect(self._flush_widget_refresh)
+        # Collapses a burst of resize requests (e.g. several devices
+        # discovered together) into one relayout
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(30)
+        self._resize_timer.timeout.connect(self._do_adjust_window_size)
         self.setup_ui()
-        self.apply_dark_theme()
         self.setup_system_tray()
 
-        # Connect discovery signals
-        self.discovery.device_found.connect(self.add_keylight)
-        self.discovery.mac_fetch_requested.connect(self.fetch_device_mac)
+        # Connect discovery signals. Queued so widget construction runs in its
+        # own event-loop pass rather than inside the discovery coroutine.
+        self.discovery.device_found.connect(self.add_keylight, Qt.QueuedConnection)
+
+        # Show devices from the last session while mDNS catches up
+        QTimer.singleShot(0, self._restore_known_devices)
 
         # Start discovery
         self.discovery.start_discovery()
@@ -60,6 +107,7 @@ class KeyLightController(QMainWindow):
         # Apply preferences on startup and subscribe to changes
         self._apply_all_preferences()
         self.prefs.setting_changed.connect(self._on_setting_changed)
+        self.prefs.settings_applied.connect(self._on_settings_applied)
 
     def setup_ui(self):
         """Setup the main UI"""
@@ -74,6 +122,7 @@ class KeyLightController(QMainWindow):
         self.widget_height = 140
 
         central_widget = QWidget()
+        central_widget.setObjectName("RootBg")
         self.setCentralWidget(central_widget)
 
         main_layout = QVBoxLayout(central_widget)
@@ -93,10 +142,12 @@ class KeyLightController(QMainWindow):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        # The viewport takes its background from the application palette
+        self.scroll_area.viewport().setAutoFillBackground(True)
 
         # Device container
         self.devices_container = QWidget()
-        self.devices_container.setStyleSheet("background-color: #1a1a1a;")
+        self.devices_container.setObjectName("ScrollBg")
         self.devices_layout = QVBoxLayout(self.devices_container)
         self.devices_layout.setContentsMargins(8, 8, 8, 8)
         self.devices_layout.setSpacing(8)
@@ -149,7 +200,6 @@ class KeyLightController(QMainWindow):
 
         self.sync_container = QWidget()
         self.sync_container.setVisible(False)
-        self.sync_container.setStyleSheet("background-color: transparent;")
         sync_layout = QHBoxLayout(self.sync_container)
         sync_layout.setContentsMargins(0, 0, 0, 0)
         sync_layout.setSpacing(4)
@@ -257,6 +307,11 @@ class KeyLightController(QMainWindow):
                     widget.update_power_button_style()
                     widget.schedule_update()
 
+        # A power toggle should not wait out the throttle interval; send the
+        # whole batch now (each device gets its own concurrent request)
+        self.widget_update_timer.stop()
+        self._flush_widget_updates()
+
         self.update_master_button_state()
         self.update_master_button_style()
 
@@ -492,6 +547,35 @@ class KeyLightController(QMainWindow):
             self.sync_timer.start()
         self.update_master_button_style()
 
+    def schedule_widget_update(self, widget):
+        """Queue a widget's state to be sent with the next batch."""
+        self._dirty_widgets.add(widget)
+        if not self.widget_update_timer.isActive():
+            # Wait only for the remainder of the interval since the last
+            # flush, so a change after an idle period goes out immediately
+            elapsed_ms = int((time.monotonic() - self._last_widget_flush) * 1000)
+            self.widget_update_timer.start(max(0, self._widget_update_interval_ms - elapsed_ms))
+
+    def _flush_widget_updates(self):
+        self._last_widget_flush = time.monotonic()
+        dirty, self._dirty_widgets = self._dirty_widgets, set()
+        for widget in dirty:
+            self.service.queue_light_state(widget.keylight)
+
+    def schedule_widget_refresh(self, widget):
+        """Queue a widget's labels and colors for the next frame's refresh."""
+        self._refresh_widgets.add(widget)
+        if not self.widget_refresh_timer.isActive():
+            self.widget_refresh_timer.start()
+
+    def _flush_widget_refresh(self):
+        refresh, self._refresh_widgets = self._refresh_widgets, set()
+        for widget in refresh:
+            widget.refresh_slider_ui()
+        # Colors follow on release rather than on every drag step
+        if not any(widget.is_dragging() for widget in refresh):
+            self.update_master_button_style()
+
     def process_pending_sync(self):
         if not self.pending_sync_updates:
             self.sync_timer.stop()
@@ -503,13 +587,17 @@ class KeyLightController(QMainWindow):
 
     def update_master_button_style(self):
         if self.master_power_button.isChecked() and self.keylights:
-            device_colors = []
-            for widget in self.keylight_widgets:
-                if widget.keylight.on:
-                    r, g, b = widget.to_slider_color(widget.keylight.temperature)
-                    alpha = widget.keylight.brightness / 100.0
-                    device_colors.append((r, g, b, alpha))
+            device_colors = [
+                (*slider_color_for_temp(kl.temperature), kl.brightness / 100.0)
+                for kl in self.keylights
+                if kl.on
+            ]
+            # setStyleSheet re-parses and restyles; skip it when nothing changed
+            key = tuple(device_colors)
+            if key == self._master_style_key:
+                return
             if device_colors:
+                self._master_style_key = key
                 if len(device_colors) == 1:
                     r, g, b, alpha = device_colors[0]
                     color = f"rgba({r}, {g}, {b}, {alpha})"
@@ -526,11 +614,12 @@ class KeyLightController(QMainWindow):
                         """
                     )
                 else:
-                    gradient_stops = []
-                    for i, (r, g, b, alpha) in enumerate(device_colors):
-                        position = i / (len(device_colors) - 1)
-                        gradient_stops.append(f"stop:{position:.2f} rgba({r}, {g}, {b}, {alpha})")
-                    gradient = "qlineargradient(x1:0, y1:0, x2:1, y2:0, " + ", ".join(gradient_stops) + ")"
+                    positions = _gradient_stop_positions(len(device_colors))
+                    gradient_stops = ", ".join(
+                        f"{position} rgba({r}, {g}, {b}, {alpha})"
+                        for position, (r, g, b, alpha) in zip(positions, device_colors)
+                    )
+                    gradient = f"qlineargradient(x1:0, y1:0, x2:1, y2:0, {gradient_stops})"
                     avg_r = sum(r for r, g, b, a in device_colors) // len(device_colors)
                     avg_g = sum(g for r, g, b, a in device_colors) // len(device_colors)
                     avg_b = sum(b for r, g, b, a in device_colors) // len(device_colors)
@@ -552,6 +641,9 @@ class KeyLightController(QMainWindow):
             self._apply_default_master_style()
 
     def _apply_default_master_style(self):
+        if self._master_style_key == ():
+            return
+        self._master_style_key = ()
         self.master_power_button.setStyleSheet(
             """
             QPushButton#masterPowerButton {
@@ -588,31 +680,36 @@ class KeyLightController(QMainWindow):
         self.update_master_button_style()
 
     def apply_blur_effect(self):
-        blur_effect = QGraphicsBlurEffect()
-        blur_effect.setBlurRadius(8)
-        self.centralWidget().setGraphicsEffect(blur_effect)
+        # A translucent overlay instead of a blur: no grab or filter pass,
+        # just one flat fill over the window while a dialog is open
+        central = self.centralWidget()
+        if self._dim_overlay is None:
+            self._dim_overlay = QWidget(central)
+            self._dim_overlay.setAttribute(Qt.WA_StyledBackground, True)
+            self._dim_overlay.setStyleSheet("background-color: rgba(0, 0, 0, 140);")
+        self._dim_overlay.setGeometry(central.rect())
+        self._dim_overlay.raise_()
+        self._dim_overlay.show()
 
     def remove_blur_effect(self):
-        self.centralWidget().setGraphicsEffect(None)
+        if self._dim_overlay is not None:
+            self._dim_overlay.hide()
 
     def prepare_for_dialog(self):
-        self.apply_blur_effect()
-        self.original_size = self.size()
+        # Grow the window first so the overlay is laid out once at its final size
+        self._original_size = self.size()
         dialog_height = 140
         current_height = self.height()
         if current_height < dialog_height + 100:
             new_height = dialog_height + 200
             self.resize(self.width(), new_height)
+        self.apply_blur_effect()
 
     def cleanup_after_dialog(self):
         self.remove_blur_effect()
-        if hasattr(self, "original_size"):
-            self.resize(self.original_size)
-            delattr(self, "original_size")
-
-    def apply_dark_theme(self):
-        from ui.styles.dark_theme import get_style
-        self.setStyleSheet(get_style())
+        if self._original_size is not None:
+            self.resize(self._original_size)
+            self._original_size = None
 
     def setup_system_tray(self):
         self.tray_icon = create_tray_icon(self)
@@ -634,6 +731,20 @@ class KeyLightController(QMainWindow):
         from PySide6.QtWidgets import QApplication as _QApp
         _QApp.quit()
 
+    def _on_config_save_failed(self, message):
+        tray = getattr(self, "tray_icon", None)
+        if tray is not None and tray.isVisible():
+            tray.showMessage("Key Light Control", message, QSystemTrayIcon.Warning)
+        else:
+            QMessageBox.warning(self, "Key Light Control", message)
+
+    async def aclose(self):
+        """Release shared network resources once the UI loop has stopped."""
+        # The window is going away; the exit-time flush must not signal it
+        self.device_config.on_save_failed = None
+        await self.discovery.aclose()
+        await self.service.aclose()
+
     def on_tray_activated(self, reason):
         if reason == QSystemTrayIcon.Trigger:
             if self.isVisible():
@@ -661,7 +772,7 @@ class KeyLightController(QMainWindow):
     def _on_setting_changed(self, key: str, _value):
         if key.startswith("features."):
             self._apply_features_visibility()
-        elif key == "perf.widget_update_interval_ms":
+        elif key in ("perf.widget_update_interval_ms", "perf.widget_min_update_spacing_ms"):
             self._apply_widget_update_interval()
         elif key == "perf.sync_timer_interval_ms":
             self._apply_sync_timer_interval()
@@ -678,6 +789,10 @@ class KeyLightController(QMainWindow):
         elif key == "features.enable_discovery":
             self._apply_enable_discovery()
 
+    def _on_settings_applied(self, _snapshot):
+        # Bulk changes (resets) arrive as one signal; re-apply everything once
+        self._apply_all_preferences()
+
     def _apply_features_visibility(self):
         show_sync = True
         try:
@@ -699,15 +814,14 @@ class KeyLightController(QMainWindow):
             self.master_device_widget.setVisible(False)
 
     def _apply_widget_update_interval(self):
+        # At most one batch is sent per timer period, so the period also
+        # enforces the minimum spacing between updates
         try:
             interval = int(self.prefs.get("perf.widget_update_interval_ms", 50))
+            min_spacing = int(self.prefs.get("perf.widget_min_update_spacing_ms", 100))
         except Exception:
-            interval = 50
-        for w in self.keylight_widgets:
-            try:
-                w.update_timer.setInterval(interval)
-            except Exception:
-                pass
+            interval, min_spacing = 50, 100
+        self._widget_update_interval_ms = max(interval, min_spacing, 0)
 
     def _apply_sync_timer_interval(self):
         try:
@@ -722,7 +836,7 @@ class KeyLightController(QMainWindow):
         except Exception:
             to_s = 2.0
         try:
-            self.service._timeout = to_s  # update runtime timeout
+            self.service.timeout = to_s  # update runtime timeout
         except Exception:
             pass
 
@@ -807,20 +921,38 @@ class KeyLightController(QMainWindow):
         except Exception:
             pass
 
-    def fetch_device_mac(self, device_info):
-        asyncio.create_task(self._fetch_and_add_device(device_info))
-
-    async def _fetch_and_add_device(self, device_info):
-        mac_address = await self.discovery._get_device_mac_address(
-            device_info["ip"], device_info["port"]
+    def _restore_known_devices(self):
+        for mac, data in list(self.device_config.get_all_devices().items()):
+            # IP_ fallback keys can never be confirmed by the resolver
+            if data.get("last_ip") and self.device_config.is_stable_key(mac):
+                asyncio.ensure_future(self._add_if_reachable({
+                    "name": data.get("original_name", data["last_ip"]),
+                    "ip": data["last_ip"],
+                    "port": data.get("last_port", 9123),
+                    "mac_address": mac,
+                }))
+
+    async def _add_if_reachable(self, device_info):
+        # The device may have moved or gone away, and DHCP may have handed
+        # its address to another light; only restore it if the light there
+        # is the same device. The same resolver as discovery (device, then
+        # ARP) keeps the keys comparable. mDNS reports it otherwise.
+        mac = await self.discovery.resolve_identifier(
+            device_info["ip"], device_info["port"], device_info["name"]
         )
-        device_info["mac_address"] = mac_address
-        self.discovery.device_found.emit(device_info)
+        if mac is not None and mac == device_info["mac_address"]:
+            self.add_keylight(device_info)
 
     def add_keylight(self, device_info):
-        for kl in self.keylights:
-            if kl.ip == device_info["ip"]:
-                return
+        key = device_info.get("mac_address") or device_info["ip"]
+        for previous in device_info.get("previous_ids", ()):
+            self.device_config.migrate_device(previous, key)
+        existing = self._widgets_by_key.get(key)
+        if existing is not None:
+            self._refresh_keylight(existing, device_info)
+            return
+        if device_info["ip"] in self._keylights_by_ip:
+            return
         keylight = KeyLight(
             name=device_info["name"],
             ip=device_info["ip"],
@@ -828,11 +960,14 @@ class KeyLightController(QMainWindow):
             mac_address=device_info.get("mac_address", ""),
         )
         self.keylights.append(keylight)
+        self._keylights_by_ip[keylight.ip] = keylight
+        self.device_config.record_device(keylight.mac_address, keylight.name, keylight.ip, keylight.port)
         widget = KeyLightWidget(keylight, self)
         widget.power_state_changed.connect(self.update_master_button_state)
         custom_label = self.device_config.get_label(keylight.mac_address, keylight.name)
         widget.name_label.setText(custom_label)
         self.keylight_widgets.append(widget)
+        self._widgets_by_key[key] = widget
         self.devices_layout.addWidget(widget)
         # If discovery disabled, apply hide/dim behavior to new widgets
         try:
@@ -852,16 +987,45 @@ class KeyLightController(QMainWindow):
                 widget.setVisible(False)
             if dim:
                 widget.setEnabled(False)
-        if self.master_device_widget:
-            self.master_device_widget.update_device_count()
-            if len(self.keylights) == 1:
-                self.master_device_widget.update_from_devices()
+        if self.master_device_widget and len(self.keylights) == 1:
+            self.master_device_widget.update_from_devices()
         if hasattr(self, "master_device_widget") and self.master_device_widget.isVisible():
             widget.setVisible(False)
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        # A discovery burst adds several devices in a row; refresh once after it
+        if not self._pending_refresh:
+            self._pending_refresh = True
+            QTimer.singleShot(0, self._flush_refresh)
+
+    def _flush_refresh(self):
+        self._pending_refresh = False
+        if self.master_device_widget:
+            self.master_device_widget.update_device_count()
         self.adjust_window_size()
         self.update_master_button_state()
 
+    def _refresh_keylight(self, widget, device_info):
+        """Point an existing widget at a re-announced device instead of rebuilding it."""
+        keylight = widget.keylight
+        ip = device_info["ip"]
+        port = device_info.get("port", keylight.port)
+        if (ip, port) != (keylight.ip, keylight.port):
+            # DHCP moved the device; re-key it rather than adding a duplicate
+            if self._keylights_by_ip.get(keylight.ip) is keylight:
+                del self._keylights_by_ip[keylight.ip]
+            keylight.set_address(ip, port)
+            self._keylights_by_ip[ip] = keylight
+        if device_info["name"] != keylight.name:
+            keylight.name = device_info["name"]
+            widget.name_label.setText(self.device_config.get_label(keylight.mac_address, keylight.name))
+        self.device_config.record_device(keylight.mac_address, keylight.name, keylight.ip, keylight.port)
+
     def adjust_window_size(self):
+        self._resize_timer.start()
+
+    def _do_adjust_window_size(self):
         master_panel_height = 60
         title_bar = 35
         margins = 16
@@ -882,8 +1046,19 @@ class KeyLightController(QMainWindow):
         else:
             self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # The only place the overlay needs re-fitting once it is showing
+        if self._dim_overlay is not None and self._dim_overlay.isVisible():
+            self._dim_overlay.setGeometry(self.centralWidget().rect())
+
     def closeEvent(self, event):
         from PySide6.QtWidgets import QApplication as _QApp
+        # Only a close from the window system can be Shift+close; programmatic
+        # closes (e.g. while quitting) are accepted without asking for modifiers
+        if not event.spontaneous():
+            super().closeEvent(event)
+            return
         modifiers = _QApp.keyboardModifiers()
         if modifiers == Qt.ShiftModifier:
             self.discovery.stop_discovery()
@@ -5,8 +5,10 @@ from PySide6.QtWidgets import QSlider
 class JumpSlider(QSlider):
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
-            new_val = self.minimum() + (self.maximum() - self.minimum()) * event.position().x() / self.width()
-            self.setValue(round(new_val))
+            width = max(1, self.width())
+            x = min(max(int(event.position().x()), 0), width)
+            # Integer rounding of minimum + span * x / width
+            new_val = self.minimum() + ((self.maximum() - self.minimum()) * x + width // 2) // width
+            self.setValue(new_val)
             event.accept()
         super().mousePressEvent(event)
-
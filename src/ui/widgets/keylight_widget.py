@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 import asyncio
-import time
 from typing import Optional, Tuple
 
-from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QFrame,
     QVBoxLayout,
@@ -22,6 +21,7 @@ from utils.color_utils import (
     elgato_to_kelvin as util_elgato_to_kelvin,
     slider_color_for_temp as util_slider_color_for_temp,
     percent_to_hex_alpha as util_percent_to_hex_alpha,
+    rgba_for_light as util_rgba_for_light,
 )
 
 
@@ -30,25 +30,32 @@ class KeyLightWidget(QFrame):
 
     power_state_changed = Signal()
 
+    # Only the color varies per device; the rest of the on/off look lives in
+    # the theme, keyed on the "powered" property, so this is all Qt re-parses
+    _POWER_ON_QSS = "QPushButton#powerButton{{background-color:{color};}}"
+
     def __init__(self, keylight: KeyLight, parent=None):
         super().__init__(parent)
         self.keylight = keylight
         self.is_locked = False  # Lock state for sync protection
-        self.pending_update = None
-        self.last_update_time = 0.0
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.process_pending_update)
-        self.update_timer.setInterval(50)  # Process updates every 50ms max
+        self._controller = None  # Resolved on first use by _find_controller
+        self._device_menu: Optional[QMenu] = None  # Built by _build_device_menu
+        # Power button color currently applied (None = off style, "" = unstyled)
+        self._power_color: Optional[str] = ""
         self.setup_ui()
         self.update_from_device()
         self.load_lock_state()
 
     # ----- Utilities -----
     def _find_controller(self):
-        controller = self.parent()
-        while controller is not None and getattr(controller.__class__, "__name__", "") != "KeyLightController":
-            controller = controller.parent()
-        return controller
+        # The owning window never changes, so the parent walk only runs
+        # until it has been found once
+        if self._controller is None:
+            controller = self.parent()
+            while controller is not None and getattr(controller.__class__, "__name__", "") != "KeyLightController":
+                controller = controller.parent()
+            self._controller = controller
+        return self._controller
 
     @staticmethod
     def to_kelvin(value: int) -> int:
@@ -66,9 +73,7 @@ class KeyLightWidget(QFrame):
         return util_percent_to_hex_alpha(percent)
 
     def keylight_color(self) -> str:
-        r, g, b = self.to_slider_color(self.keylight.temperature)
-        a = int(255 * (self.keylight.brightness / 100))
-        return f"rgba({r}, {g}, {b}, {a})"
+        return util_rgba_for_light(self.keylight.temperature, self.keylight.brightness)
 
     # ----- UI Setup -----
     def setup_ui(self) -> None:
@@ -118,6 +123,7 @@ class KeyLightWidget(QFrame):
         self.brightness_slider.setValue(max(1, self.keylight.brightness))
         self.brightness_slider.setObjectName("brightnessSlider")
         self.brightness_slider.valueChanged.connect(self.on_brightness_changed)
+        self.brightness_slider.sliderReleased.connect(self._on_brightness_released)
 
         self.brightness_label = QLabel(f"{self.keylight.brightness}%")
         self.brightness_label.setObjectName("sliderValue")
@@ -139,6 +145,7 @@ class KeyLightWidget(QFrame):
         self.temp_slider.setValue(self.keylight.temperature)
         self.temp_slider.setObjectName("temperatureSlider")
         self.temp_slider.valueChanged.connect(self.on_temperature_changed)
+        self.temp_slider.sliderReleased.connect(self._on_temperature_released)
 
         self.temp_label = QLabel(f"{self.to_kelvin(self.keylight.temperature)}K")
         self.temp_label.setObjectName("sliderValue")
@@ -164,90 +171,88 @@ class KeyLightWidget(QFrame):
 
     def on_brightness_changed(self, value: int) -> None:
         self.keylight.brightness = value
-        self.brightness_label.setText(f"{value}%")
-        self.schedule_update()
-        self.update_power_button_style()
-
-        controller = self._find_controller()
-        if controller:
-            controller.update_master_button_style()
-            controller.propagate_sync_changes(self, "brightness", value)
+        self._schedule_ui_refresh()
+        # While dragging only the UI follows; the device is written on release
+        if not self.brightness_slider.isSliderDown():
+            self._commit_brightness()
 
     def on_temperature_changed(self, value: int) -> None:
         self.keylight.temperature = value
-        self.temp_label.setText(f"{self.to_kelvin(value)}K")
+        self._schedule_ui_refresh()
+        if not self.temp_slider.isSliderDown():
+            self._commit_temperature()
+
+    def _on_brightness_released(self) -> None:
+        # The power color was held during the drag; settle it now
+        self._schedule_ui_refresh()
+        self._commit_brightness()
+
+    def _on_temperature_released(self) -> None:
+        self._schedule_ui_refresh()
+        self._commit_temperature()
+
+    def _commit_brightness(self) -> None:
         self.schedule_update()
-        self.update_power_button_style()
+        controller = self._find_controller()
+        if controller:
+            controller.propagate_sync_changes(self, "brightness", self.keylight.brightness)
 
+    def _commit_temperature(self) -> None:
+        self.schedule_update()
         controller = self._find_controller()
         if controller:
-            controller.update_master_button_style()
-            controller.propagate_sync_changes(self, "temperature", value)
+            controller.propagate_sync_changes(self, "temperature", self.keylight.temperature)
 
     # ----- Update Throttling -----
+    def _schedule_ui_refresh(self) -> None:
+        # The controller refreshes all changed widgets together once per frame
+        controller = self._find_controller()
+        if controller:
+            controller.schedule_widget_refresh(self)
+        else:
+            self.refresh_slider_ui()
+
+    def is_dragging(self) -> bool:
+        """True while either slider is held down."""
+        return self.brightness_slider.isSliderDown() or self.temp_slider.isSliderDown()
+
+    def refresh_slider_ui(self) -> None:
+        """Bring the value labels and power color in line with the KeyLight.
+
+        The power color is left alone mid-drag and settled on release.
+        """
+        self.brightness_label.setText(f"{self.keylight.brightness}%")
+        self.temp_label.setText(f"{self.to_kelvin(self.keylight.temperature)}K")
+        if not self.is_dragging():
+            self.update_power_button_style()
+
     def schedule_update(self) -> None:
-        self.pending_update = {
-            "on": self.keylight.on,
-            "brightness": self.keylight.brightness,
-            "temperature": self.keylight.temperature,
-        }
-        if not self.update_timer.isActive():
-            self.update_timer.start()
-
-    def process_pending_update(self) -> None:
-        if self.pending_update:
-            current_time = time.time()
-            # Determine min spacing from preferences (ms)
-            controller = self._find_controller()
-            min_gap_s = 0.1
-            if controller and hasattr(controller, 'prefs'):
-                try:
-                    min_gap_ms = int(controller.prefs.get("perf.widget_min_update_spacing_ms", 100))
-                    min_gap_s = max(0.0, min_gap_ms / 1000.0)
-                except Exception:
-                    pass
-            if current_time - self.last_update_time >= min_gap_s:
-                self.update_device()
-                self.last_update_time = current_time
-                self.pending_update = None
-                self.update_timer.stop()
+        # The controller batches updates from all widgets into one send
+        controller = self._find_controller()
+        if controller:
+            controller.schedule_widget_update(self)
+        else:
+            self.update_device()
 
     # ----- Device I/O -----
     def update_power_button_style(self) -> None:
-        if self.keylight.on:
-            color = self.keylight_color()
-            self.power_button.setStyleSheet(
-                f"""
-                QPushButton#powerButton {{
-                    background-color: {color};
-                    border: 2px solid #ffffff;
-                    font-size: 30px;
-                    color: #ffffff;
-                    padding-bottom: 2px;
-                }}
-                """
-            )
+        # setStyleSheet re-parses and re-polishes, so skip it when unchanged
+        color = self.keylight_color() if self.keylight.on else None
+        if color == self._power_color:
+            return
+        self._power_color = color
+        # setStyleSheet() below re-polishes, which picks up the property
+        self.power_button.setProperty("powered", color is not None)
+        if color is None:
+            self.power_button.setStyleSheet("")
         else:
-            self.power_button.setStyleSheet(
-                """
-                QPushButton#powerButton {
-                    background-color: transparent;
-                    border: 2px solid #555;
-                    color: #555;
-                    font-size: 30px;
-                    padding-bottom: 2px;
-                }
-                """
-            )
+            self.power_button.setStyleSheet(self._POWER_ON_QSS.format(color=color))
 
     def update_device(self) -> None:
-        asyncio.create_task(self._update_device_async())
-
-    async def _update_device_async(self) -> None:
         controller = self._find_controller()
         if controller:
             try:
-                await controller.service.set_light_state(self.keylight)
+                controller.service.queue_light_state(self.keylight)
             except Exception:
                 pass
 
@@ -276,64 +281,79 @@ class KeyLightWidget(QFrame):
 
     # ----- Menus & Locking -----
     def show_device_menu(self) -> None:
-        menu = QMenu(self)
-
         controller = self._find_controller()
         if not controller:
             return
 
+        # Built on first use and reused; only state-dependent bits change
+        if self._device_menu is None:
+            self._build_device_menu(controller)
+
         # Optional: rename action
         show_rename = True
         try:
             show_rename = bool(controller.prefs.get("features.show_rename_action", True))
         except Exception:
             pass
-        if show_rename:
-            rename_action = QAction("Rename Device", self)
-            rename_action.triggered.connect(lambda: self.rename_device(controller))
-            menu.addAction(rename_action)
+        self._rename_action.setVisible(show_rename)
 
-        reset_action = QAction("Reset to Default", self)
-        reset_action.triggered.connect(lambda: self.reset_label(controller))
         has_custom = controller.device_config.has_custom_label(self.keylight.mac_address)
-        reset_action.setEnabled(has_custom)
-        menu.addAction(reset_action)
+        self._reset_action.setEnabled(has_custom)
+
+        self._lock_action.setText("Unlock Device" if self.is_locked else "Lock Device")
+
+        show_sync = len(controller.keylights) > 1
+        for action in self._sync_actions:
+            action.setVisible(show_sync)
+
+        self._device_menu.exec_(QCursor.pos())
+
+    def _build_device_menu(self, controller) -> None:
+        menu = QMenu(self)
+
+        self._rename_action = QAction("Rename Device", self)
+        self._rename_action.triggered.connect(lambda: self.rename_device(controller))
+        menu.addAction(self._rename_action)
+
+        self._reset_action = QAction("Reset to Default", self)
+        self._reset_action.triggered.connect(lambda: self.reset_label(controller))
+        menu.addAction(self._reset_action)
 
         menu.addSeparator()
 
-        lock_text = "Unlock Device" if self.is_locked else "Lock Device"
-        lock_action = QAction(lock_text, self)
-        lock_action.triggered.connect(self.toggle_lock)
-        menu.addAction(lock_action)
+        self._lock_action = QAction("Lock Device", self)
+        self._lock_action.triggered.connect(self.toggle_lock)
+        menu.addAction(self._lock_action)
 
-        if len(controller.keylights) > 1:
-            menu.addSeparator()
-            sync_temp_action = QAction("Copy temperature to devices", self)
-            sync_temp_action.triggered.connect(lambda: self.sync_to_others(controller, "temperature"))
-            menu.addAction(sync_temp_action)
+        # Separator and copy actions, shown only with more than one device
+        self._sync_actions = [menu.addSeparator()]
+        sync_temp_action = QAction("Copy temperature to devices", self)
+        sync_temp_action.triggered.connect(lambda: self.sync_to_others(controller, "temperature"))
+        menu.addAction(sync_temp_action)
 
-            sync_brightness_action = QAction("Copy brightness to devices", self)
-            sync_brightness_action.triggered.connect(lambda: self.sync_to_others(controller, "brightness"))
-            menu.addAction(sync_brightness_action)
+        sync_brightness_action = QAction("Copy brightness to devices", self)
+        sync_brightness_action.triggered.connect(lambda: self.sync_to_others(controller, "brightness"))
+        menu.addAction(sync_brightness_action)
 
-            sync_all_action = QAction("Copy all settings to devices", self)
-            sync_all_action.triggered.connect(lambda: self.sync_to_others(controller, "all"))
-            menu.addAction(sync_all_action)
+        sync_all_action = QAction("Copy all settings to devices", self)
+        sync_all_action.triggered.connect(lambda: self.sync_to_others(controller, "all"))
+        menu.addAction(sync_all_action)
+        self._sync_actions += [sync_temp_action, sync_brightness_action, sync_all_action]
 
-        menu.exec_(QCursor.pos())
+        self._device_menu = menu
 
     def rename_device(self, controller) -> None:
         original_name = controller.device_config.get_label(self.keylight.mac_address, self.keylight.name)
-        controller.show_blur_overlay()
+        controller.prepare_for_dialog()
         try:
-            controller.adjust_window_size_for_dialog()
             dialog = RenameDeviceDialog(original_name, self.keylight.name, controller)
             if dialog.exec():
                 new_name = dialog.get_name()
                 if new_name and new_name != original_name:
+                    # Saved right away so a failure is known before the label changes
                     success = controller.device_config.set_label(
                         self.keylight.mac_address, original_name, new_name, self.keylight.ip
-                    )
+                    ) and controller.device_config.flush()
                     if success:
                         self.name_label.setText(new_name)
                     else:
@@ -343,7 +363,8 @@ class KeyLightWidget(QFrame):
 
     def reset_label(self, controller) -> None:
         original_name = self.keylight.name
-        success = controller.device_config.remove_label(self.keylight.mac_address)
+        success = (controller.device_config.remove_label(self.keylight.mac_address)
+                   and controller.device_config.flush())
         if success:
             self.name_label.setText(original_name)
         else:
@@ -1,4 +1,4 @@
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
     QFrame,
     QVBoxLayout,
@@ -9,16 +9,41 @@ from PySide6.QtWidgets import (
     QMenu,
 )
 from PySide6.QtGui import QAction, QCursor
-import math
+
+from utils.color_utils import blackbody_rgb_for_temp, elgato_to_ascending_kelvin
 
 
 class MasterDeviceWidget(QFrame):
     """Master control widget that looks like a device but controls all devices."""
 
+    # Kept compact: they are re-parsed whenever the button color changes
+    _POWER_ON_QSS = (
+        "QPushButton#masterPowerButton{{background-color:{color};border:2px solid #ffffff;"
+        "border-radius:18px;font-size:16px;font-weight:bold;color:#ffffff;}}"
+        "QPushButton#masterPowerButton:hover{{border:2px solid #cccccc;}}"
+    )
+    _POWER_OFF_QSS = (
+        "QPushButton#masterPowerButton{background-color:#404040;border:2px solid #666666;"
+        "border-radius:18px;color:#888888;font-size:16px;font-weight:bold;}"
+        "QPushButton#masterPowerButton:hover{background-color:#4a4a4a;border:2px solid #777777;}"
+    )
+
+    # Slider drags reach the device widgets at most once per interval
+    PROPAGATE_INTERVAL_MS = 50
+
     def __init__(self, controller, parent=None):
         super().__init__(parent)
         self.controller = controller
         self.ignore_locks = True  # Enabled by default
+        # Color behind the power button's current stylesheet (None when off)
+        self._power_color = ""
+        # Latest slider values not yet pushed to the device widgets
+        self._pending_brightness = None
+        self._pending_temperature = None
+        self._propagate_timer = QTimer(self)
+        self._propagate_timer.setSingleShot(True)
+        self._propagate_timer.setInterval(self.PROPAGATE_INTERVAL_MS)
+        self._propagate_timer.timeout.connect(self._on_propagate_timeout)
         self.setup_ui()
 
     def setup_ui(self):
@@ -44,6 +69,7 @@ class MasterDeviceWidget(QFrame):
 
         # Device name
         device_count = len(self.controller.keylights)
+        self._device_count = device_count
         self.name_label = QLabel(f"Master ({device_count} devices)")
         self.name_label.setObjectName("deviceName")
         header_layout.addWidget(self.name_label)
@@ -73,6 +99,7 @@ class MasterDeviceWidget(QFrame):
         self.brightness_slider.setRange(1, 100)
         self.brightness_slider.setValue(50)
         self.brightness_slider.valueChanged.connect(self.brightness_changed)
+        self.brightness_slider.sliderReleased.connect(self._on_slider_released)
         brightness_layout.addWidget(self.brightness_slider)
 
         self.brightness_label = QLabel("50%")
@@ -96,6 +123,7 @@ class MasterDeviceWidget(QFrame):
         self.temp_slider.setRange(143, 344)
         self.temp_slider.setValue(250)
         self.temp_slider.valueChanged.connect(self.temperature_changed)
+        self.temp_slider.sliderReleased.connect(self._on_slider_released)
         temp_layout.addWidget(self.temp_slider)
 
         self.temp_label = QLabel("5000K")
@@ -109,6 +137,9 @@ class MasterDeviceWidget(QFrame):
 
     def update_device_count(self):
         device_count = len(self.controller.keylights)
+        if device_count == self._device_count:
+            return
+        self._device_count = device_count
         self.name_label.setText(f"Master ({device_count} devices)")
 
     def toggle_ignore_locks(self):
@@ -155,35 +186,65 @@ class MasterDeviceWidget(QFrame):
         if not self.controller.keylights:
             return
         self.brightness_label.setText(f"{value}%")
-        for widget in self.controller.keylight_widgets:
-            if not self.ignore_locks and getattr(widget, "is_locked", False):
-                continue
-            widget.keylight.brightness = value
-            old = widget.brightness_slider.blockSignals(True)
-            widget.brightness_slider.setValue(value)
-            widget.brightness_slider.blockSignals(old)
-            widget.brightness_label.setText(f"{value}%")
-            widget.update_power_button_style()
-            widget.schedule_update()
+        self._pending_brightness = value
+        self._queue_propagation()
 
     def temperature_changed(self, value):
         if not self.controller.keylights:
             return
-        kelvin = self.to_kelvin(value)
-        self.temp_label.setText(f"{kelvin}K")
+        self.temp_label.setText(f"{self.to_kelvin(value)}K")
+        self._pending_temperature = value
+        self._queue_propagation()
+
+    def _queue_propagation(self):
+        # Leading edge applies at once; later ticks wait for the timer
+        if self._propagate_timer.isActive():
+            return
+        self._apply_pending()
+        self._propagate_timer.start()
+
+    def _on_propagate_timeout(self):
+        # Trailing edge: apply whatever arrived during the interval
+        if self._pending_brightness is None and self._pending_temperature is None:
+            return
+        self._apply_pending()
+        self._propagate_timer.start()
+
+    def _on_slider_released(self):
+        # Apply the final value and write it to the devices
+        self._propagate_timer.stop()
+        self._apply_pending()
+
+    def _apply_pending(self):
+        brightness, temperature = self._pending_brightness, self._pending_temperature
+        self._pending_brightness = self._pending_temperature = None
+        # Mid-drag only the device sliders and labels follow; colors and
+        # device writes wait for the release
+        commit = not (self.brightness_slider.isSliderDown() or self.temp_slider.isSliderDown())
+        if temperature is not None:
+            kelvin = self.to_kelvin(temperature)
         for widget in self.controller.keylight_widgets:
             if not self.ignore_locks and getattr(widget, "is_locked", False):
                 continue
-            widget.keylight.temperature = value
-            old = widget.temp_slider.blockSignals(True)
-            widget.temp_slider.setValue(value)
-            widget.temp_slider.blockSignals(old)
-            widget.temp_label.setText(f"{kelvin}K")
-            widget.update_power_button_style()
-            widget.schedule_update()
+            if brightness is not None:
+                widget.keylight.brightness = brightness
+                old = widget.brightness_slider.blockSignals(True)
+                widget.brightness_slider.setValue(brightness)
+                widget.brightness_slider.blockSignals(old)
+                widget.brightness_label.setText(f"{brightness}%")
+            if temperature is not None:
+                widget.keylight.temperature = temperature
+                old = widget.temp_slider.blockSignals(True)
+                widget.temp_slider.setValue(temperature)
+                widget.temp_slider.blockSignals(old)
+                widget.temp_label.setText(f"{kelvin}K")
+            if commit:
+                # Colors are settled once the drag ends, with the device write
+                widget.update_power_button_style()
+                widget.schedule_update()
 
     def to_kelvin(self, slider_value):
-        return int(2900 + (slider_value - 143) * (7000 - 2900) / (344 - 143))
+        return elgato_to_ascending_kelvin(slider_value)
 
     def update_from_devices(self):
         if not self.controller.keylights:
@@ -204,16 +265,7 @@ class MasterDeviceWidget(QFrame):
         for widget in self.controller.keylight_widgets:
             if widget.keylight.on:
                 brightness = widget.keylight.brightness / 100.0
-                temp = widget.keylight.temperature
-                kelvin = 2900 + (temp - 143) * (7000 - 2900) / (344 - 143)
-                if kelvin <= 6600:
-                    r = 255
-                    g = int(99.4708025861 * math.log(kelvin / 100) - 161.1195681661) if kelvin > 2000 else 255
-                    b = int(138.5177312231 * math.log(kelvin / 100 - 10) - 305.0447927307) if kelvin >= 2000 else 255
-                else:
-                    r = int(329.698727446 * ((kelvin / 100 - 60) ** -0.1332047592))
-                    g = int(288.1221695283 * ((kelvin / 100 - 60) ** -0.0755148492))
-                    b = 255
+                r, g, b = blackbody_rgb_for_temp(widget.keylight.temperature)
                 r = int(r * brightness)
                 g = int(g * brightness)
                 b = int(b * brightness)
@@ -221,44 +273,19 @@ class MasterDeviceWidget(QFrame):
                 total_g += g
                 total_b += b
                 device_count += 1
-        color = "#404040"
-        if device_count > 0:
+        color = None
+        if self.power_button.isChecked() and device_count > 0:
             avg_r = min(255, total_r // device_count)
             avg_g = min(255, total_g // device_count)
             avg_b = min(255, total_b // device_count)
             color = f"rgb({avg_r}, {avg_g}, {avg_b})"
-        if self.power_button.isChecked() and device_count > 0:
-            self.power_button.setStyleSheet(
-                f"""
-                QPushButton#masterPowerButton {{
-                    background-color: {color};
-                    border: 2px solid #ffffff;
-                    border-radius: 18px;
-                    font-size: 16px;
-                    font-weight: bold;
-                    color: #ffffff;
-                }}
-                QPushButton#masterPowerButton:hover {{
-                    border: 2px solid #cccccc;
-                }}
-                """
-            )
-            self.power_button.setText("●")
-        else:
-            self.power_button.setStyleSheet(
-                """
-                QPushButton#masterPowerButton {
-                    background-color: #404040;
-                    border: 2px solid #666666;
-                    border-radius: 18px;
-                    color: #888888;
-                    font-size: 16px;
-                    font-weight: bold;
-                }
-                QPushButton#masterPowerButton:hover {
-                    background-color: #4a4a4a;
-                    border: 2px solid #777777;
-                }
-                """
-            )
+        # setStyleSheet re-parses and re-polishes, so skip it when unchanged
+        if color == self._power_color:
+            return
+        self._power_color = color
+        if color is None:
+            self.power_button.setStyleSheet(self._POWER_OFF_QSS)
             self.power_button.setText("○")
+        else:
+            self.power_button.setStyleSheet(self._POWER_ON_QSS.format(color=color))
+            self.power_button.setText("●")
@@ -1,11 +1,54 @@
+from typing import Optional
+
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QDialogButtonBox
 from PySide6.QtGui import QIcon
 
+# Shared null icon used to strip the default button icons; created on first
+# use because Qt objects should not be built before the QApplication exists
+_EMPTY_ICON: Optional[QIcon] = None
+
+_RENAME_DIALOG_CSS = """
+    QDialog {
+        background-color: #2a2a2a;
+        color: #ffffff;
+    }
+    QLineEdit {
+        background-color: #3a3a3a;
+        border: 1px solid #555555;
+        border-radius: 4px;
+        padding: 8px;
+        color: #ffffff;
+        font-size: 14px;
+    }
+    QLineEdit:focus {
+        border: 2px solid #00E5FF;
+    }
+    QPushButton {
+        background-color: #3a3a3a;
+        border: 1px solid #555555;
+        border-radius: 4px;
+        padding: 6px 12px;
+        color: #ffffff;
+        min-width: 60px;
+    }
+    QPushButton:hover {
+        background-color: #4a4a4a;
+    }
+    QPushButton:default {
+        background-color: #00E5FF;
+        color: #000000;
+        font-weight: bold;
+    }
+    """
+
 
 class RenameDeviceDialog(QDialog):
     """Simple, functional dialog for renaming devices."""
 
     def __init__(self, current_name: str, original_name: str, parent=None):
+        global _EMPTY_ICON
+        if _EMPTY_ICON is None:
+            _EMPTY_ICON = QIcon()
         super().__init__(parent)
         self.setWindowTitle("Rename Device")
         self.setModal(True)
@@ -27,8 +70,8 @@ class RenameDeviceDialog(QDialog):
         cancel_button = button_box.button(QDialogButtonBox.Cancel)
         ok_button.setText("Save")
         cancel_button.setText("Cancel")
-        ok_button.setIcon(QIcon())  # Remove icon
-        cancel_button.setIcon(QIcon())  # Remove icon
+        ok_button.setIcon(_EMPTY_ICON)  # Remove icon
+        cancel_button.setIcon(_EMPTY_ICON)  # Remove icon
 
         button_box.accepted.connect(self.accept)
         button_box.rejected.connect(self.reject)
@@ -39,41 +82,7 @@ class RenameDeviceDialog(QDialog):
 
         # Focus and style
         self.name_input.setFocus()
-        self.setStyleSheet(
-            """
-            QDialog {
-                background-color: #2a2a2a;
-                color: #ffffff;
-            }
-            QLineEdit {
-                background-color: #3a3a3a;
-                border: 1px solid #555555;
-                border-radius: 4px;
-                padding: 8px;
-                color: #ffffff;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #00E5FF;
-            }
-            QPushButton {
-                background-color: #3a3a3a;
-                border: 1px solid #555555;
-                border-radius: 4px;
-                padding: 6px 12px;
-                color: #ffffff;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-            QPushButton:default {
-                background-color: #00E5FF;
-                color: #000000;
-                font-weight: bold;
-            }
-            """
-        )
+        self.setStyleSheet(_RENAME_DIALOG_CSS)
 
     def get_name(self) -> str:
         """Get the entered name."""
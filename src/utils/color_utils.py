@@ -1,21 +1,102 @@
 from __future__ import annotations
 
+import math
+from functools import lru_cache
+
+# Elgato temperature range (143 = coolest, 344 = warmest)
+_TEMP_MIN = 143
+_TEMP_MAX = 344
+
+
+def _elgato_to_kelvin(value: int) -> int:
+    return round((-4100 * value) / 201 + 1993300 / 201)
+
+
+# Kelvin for every valid temperature, indexed by value - _TEMP_MIN
+_KELVIN_LUT = tuple(_elgato_to_kelvin(v) for v in range(_TEMP_MIN, _TEMP_MAX + 1))
+
+
 def elgato_to_kelvin(value: int) -> int:
     """Convert Elgato temperature value (143-344) to Kelvin (~2900K-7000K)."""
-    return round((-4100 * value) / 201 + 1993300 / 201)
+    if _TEMP_MIN <= value <= _TEMP_MAX:
+        return _KELVIN_LUT[value - _TEMP_MIN]
+    return _elgato_to_kelvin(value)
 
 
-def slider_color_for_temp(value: int) -> tuple[int, int, int]:
-    """Interpolate color between #88aaff and #ff9944 for temperature slider."""
+def _elgato_to_ascending_kelvin(value: int) -> int:
+    return int(2900 + (value - _TEMP_MIN) * (7000 - 2900) / (_TEMP_MAX - _TEMP_MIN))
+
+
+# Kelvin rising with the value, indexed by value - _TEMP_MIN; the reverse
+# direction of _KELVIN_LUT, kept beside it so the two stay in step
+_ASCENDING_KELVIN_LUT = tuple(
+    _elgato_to_ascending_kelvin(v) for v in range(_TEMP_MIN, _TEMP_MAX + 1)
+)
+
+
+def elgato_to_ascending_kelvin(value: int) -> int:
+    """Map Elgato temperature 143-344 onto 2900K-7000K (the reverse of elgato_to_kelvin)."""
+    if _TEMP_MIN <= value <= _TEMP_MAX:
+        return _ASCENDING_KELVIN_LUT[value - _TEMP_MIN]
+    return _elgato_to_ascending_kelvin(value)
+
+
+def _interpolate_temp_color(value: int) -> tuple[int, int, int]:
     left = (136, 170, 255)  # #88aaff
     right = (255, 153, 68)  # #ff9944
-    t = (value - 143) / (344 - 143)
+    t = (value - _TEMP_MIN) / (_TEMP_MAX - _TEMP_MIN)
     r = int(left[0] + (right[0] - left[0]) * t)
     g = int(left[1] + (right[1] - left[1]) * t)
     b = int(left[2] + (right[2] - left[2]) * t)
     return r, g, b
 
 
+# Slider colors for every valid temperature, indexed by value - _TEMP_MIN
+_SLIDER_COLOR_LUT = tuple(
+    _interpolate_temp_color(v) for v in range(_TEMP_MIN, _TEMP_MAX + 1)
+)
+
+
+def slider_color_for_temp(value: int) -> tuple[int, int, int]:
+    """Interpolate color between #88aaff and #ff9944 for temperature slider."""
+    if _TEMP_MIN <= value <= _TEMP_MAX:
+        return _SLIDER_COLOR_LUT[value - _TEMP_MIN]
+    return _interpolate_temp_color(value)
+
+
+def _blackbody_rgb(value: int) -> tuple[int, int, int]:
+    # Tanner Helland's approximation of a black body's color at this temperature
+    kelvin = 2900 + (value - _TEMP_MIN) * (7000 - 2900) / (_TEMP_MAX - _TEMP_MIN)
+    if kelvin <= 6600:
+        r = 255
+        g = int(99.4708025861 * math.log(kelvin / 100) - 161.1195681661) if kelvin > 2000 else 255
+        b = int(138.5177312231 * math.log(kelvin / 100 - 10) - 305.0447927307) if kelvin >= 2000 else 255
+    else:
+        r = int(329.698727446 * ((kelvin / 100 - 60) ** -0.1332047592))
+        g = int(288.1221695283 * ((kelvin / 100 - 60) ** -0.0755148492))
+        b = 255
+    return r, g, b
+
+
+# Black-body colors for every valid temperature, indexed by value - _TEMP_MIN
+_BLACKBODY_LUT = tuple(_blackbody_rgb(v) for v in range(_TEMP_MIN, _TEMP_MAX + 1))
+
+
+def blackbody_rgb_for_temp(value: int) -> tuple[int, int, int]:
+    """Approximate RGB of the light emitted at an Elgato temperature value."""
+    if _TEMP_MIN <= value <= _TEMP_MAX:
+        return _BLACKBODY_LUT[value - _TEMP_MIN]
+    return _blackbody_rgb(value)
+
+
+@lru_cache(maxsize=256)
+def rgba_for_light(temperature: int, brightness: int) -> str:
+    """CSS rgba() color for a light's temperature, with brightness as alpha."""
+    r, g, b = slider_color_for_temp(temperature)
+    a = int(255 * (brightness / 100))
+    return f"rgba({r}, {g}, {b}, {a})"
+
+
 def percent_to_hex_alpha(percent: float) -> str:
     """Convert 0-100 percent to two-digit hex alpha ('FF' for 100%, '00' for 0%)."""
     percent = max(0.0, min(100.0, percent))
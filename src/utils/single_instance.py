@@ -1,4 +1,6 @@
+import os
 import socket
+import sys
 
 
 class SingleInstance:
@@ -7,20 +9,35 @@ class SingleInstance:
     def __init__(self, port: int = 45654):
         self.port = port
         self.socket = None
+        if sys.platform.startswith("linux"):
+            # Abstract-namespace Unix socket: no TCP port, no file to clean up
+            self.family = socket.AF_UNIX
+            self.address = f"\0keylight-control-{os.getuid()}"
+        else:
+            self.family = socket.AF_INET
+            self.address = ("127.0.0.1", port)
 
     def is_running(self) -> bool:
         """Check if another instance is already running."""
         try:
             # Try to bind to a local socket
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.bind(("127.0.0.1", self.port))
+            self.socket = socket.socket(self.family, socket.SOCK_STREAM)
+            self.socket.bind(self.address)
             self.socket.listen(1)
             return False  # We successfully bound, so no other instance is running
         except OSError:
             return True  # Another instance is already running
 
+    def notify_running(self) -> None:
+        """Ask the running instance to bring its window to the front."""
+        try:
+            signal_socket = socket.socket(self.family, socket.SOCK_STREAM)
+            signal_socket.connect(self.address)
+            signal_socket.close()
+        except Exception:
+            pass
+
     def cleanup(self) -> None:
         """Clean up the socket."""
         if self.socket:
             self.socket.close()
-
@@ -15,13 +15,27 @@ from PySide6.QtGui import (
 from PySide6.QtCore import Qt, QPointF
 
 
+# Pixel sizes rendered into the icon; the platform picks the closest one
+# for the tray and HiDPI screens instead of rescaling a single pixmap
+_ICON_SIZES = (16, 32, 64, 128)
+
+
 def make_keylight_icon() -> QIcon:
     """Draw a stylized Key Light: tilted dark rectangle on a stand with a bright center."""
+    icon = QIcon()
+    for pixels in _ICON_SIZES:
+        icon.addPixmap(_render_keylight_pixmap(pixels))
+    return icon
+
+
+def _render_keylight_pixmap(pixels: int) -> QPixmap:
+    # Drawn in 64x64 logical units and scaled to the requested pixel size
     size = 64
-    pm = QPixmap(size, size)
+    pm = QPixmap(pixels, pixels)
     pm.fill(Qt.transparent)
     p = QPainter(pm)
     p.setRenderHint(QPainter.Antialiasing, True)
+    p.scale(pixels / size, pixels / size)
 
     cx = size / 2
     top_y = 14.0
@@ -81,11 +95,13 @@ def make_keylight_icon() -> QIcon:
     p.drawEllipse(base_x, base_y, base_w, base_h)
 
     p.end()
-    return QIcon(pm)
+    return pm
 
 
 def create_tray_icon(window) -> QSystemTrayIcon:
     """Create and show the system tray icon and menu for the given window."""
+    # Rendered once per tray and owned by it, so no QIcon outlives the
+    # QApplication; the window only hides and re-shows this tray
     icon = make_keylight_icon()
     tray = QSystemTrayIcon(icon, window)
     tray.setToolTip("Key Light Control")